@@ -14,12 +14,53 @@ is updated, the user is notified and the record is removed from the admin view.
 The main objective of the tool is when the user wishes to purchase an item and, it is added to this portal, it notifies the user on receiving a
 updated price (mostly discounts), and enable better savings for the user.
 '''
+import asyncio
+import atexit
+import math
+import mmap
+import os
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import messagebox
-import json
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library serialiser
+    orjson = None
+    import json
 from customtkinter import *
+try:
+    from async_tkinter_loop import async_mainloop, async_handler
+except ImportError:  # Without async-tkinter-loop, handlers run to completion and block the GUI as before
+    def async_handler(func):
+        def wrapper(*args, **kwargs):
+            asyncio.run(func(*args, **kwargs))
+        return wrapper
+
+    def async_mainloop(root):
+        root.mainloop()
 # Backend imports and code
 
+# JSON helpers - orjson when available, stdlib json otherwise
+def _loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()  # stdlib json cannot parse a memoryview directly
+    return json.loads(data)
+
+def _dumps(obj, indent=True):
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(obj, indent=4 if indent else None).encode()
+
+def _parse_price(text):
+    # Price entered in the GUI as a finite float, or None if it is not a usable number
+    try:
+        price = float(text)
+    except ValueError:
+        return None
+    return price if math.isfinite(price) else None
+
 #Strategy pattern implementation using PriceUpdater and Immediate Update
 class PriceUpdater:
     # Backend code for PriceUpdater class
@@ -33,12 +74,15 @@ class PriceUpdater:
 class ImmediateUpdate:
     # Backend code for ImmediateUpdate class
     def update(self, observer_id,product_name,new_price):
-        price_fetcher = PriceFetcher()
+        price_fetcher = get_fetcher()
         price_fetcher.update_price(observer_id, product_name, new_price)
 
 #Observer pattern implementation - PriceTracker_observer()
 from abc import ABC, abstractmethod
-import random
+import itertools
+
+# Sequential observer ids; re-seeded past the stored ids when the PriceFetcher loads
+_oid_gen = itertools.count(1)
 
 class Observer(ABC):
     @abstractmethod
@@ -47,9 +91,10 @@ class Observer(ABC):
 
 # Backend code for PriceTracker_observer class
 class PriceTracker_observer(Observer):
-    def __init__(self, product_name,price):
+    def __init__(self, product_name,price,observer_id=None):
         self.product_name = product_name
-        self.observer_id=random.randint(1,1000)
+        # A new id is allocated unless re-creating the observer for an existing record
+        self.observer_id=next(_oid_gen) if observer_id is None else observer_id
         self.price=price
 
     def update(self,price):
@@ -60,52 +105,198 @@ class PriceFetcher():
     # Backend code for PriceFetcher class
     _instance = None
     file_path = 'products.json'
+    journal_path = 'products.jsonl'
+    journal_limit = 1024 * 1024  # Compact once the journal grows past 1MB
+    mmap_threshold = 64 * 1024  # Smaller files are cheaper to read() than to map
 
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.products = {}
-            cls._instance._load_data()
-        return cls._instance
+        # Kept for compatibility - prefer get_fetcher()
+        return get_fetcher()
+
+    def _setup(self):
+        self.products = {}
+        self._load_data()
+        # Unbuffered, so every journal record is a single write() call
+        self._journal = open(self.journal_path, 'ab', buffering=0)
+        self._journal_size = self._journal.tell()
+        # All disk writes go through one worker thread, in the order they were queued;
+        # self.products itself is only changed by the calling (GUI) thread
+        self._writer = ThreadPoolExecutor(max_workers=1)
+        self._write_error = None  # First failure in the writer thread, re-raised by flush()
+        atexit.register(self.close)
     
     def _load_data(self): #Serialisation using json
         try:
-            with open(self.file_path, 'r') as file:
-                self.products = json.load(file)
+            with open(self.file_path, 'rb') as file:
+                if os.fstat(file.fileno()).st_size > self.mmap_threshold:
+                    # Parse straight from the mapped pages instead of copying into a bytes object
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        with memoryview(mm) as view:
+                            self.products = _loads(view)
+                else:
+                    self.products = _loads(file.read())
         except FileNotFoundError:
             self.products = {}
             self._save_data()
+        self._replay_journal()
+
+    def _replay_journal(self):
+        # Apply the changes recorded since the last compaction on top of products.json
+        try:
+            with open(self.journal_path, 'r+b') as file:
+                lines = file.readlines()
+                for index, line in enumerate(lines):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = _loads(line)
+                    except ValueError:
+                        if index < len(lines) - 1:
+                            raise  # Only the last record can be torn by a crash
+                        # A crash mid-write left a partial last record; drop it
+                        file.truncate(file.tell() - len(line))
+                        break
+                    self._apply(record)
+                else:
+                    if lines and not lines[-1].endswith(b"\n"):
+                        file.write(b"\n")  # Keep the next appended record on its own line
+        except FileNotFoundError:
+            pass
+
+    def _apply(self, record):
+        observer_id = str(record["oid"])
+        if record["op"] == "put":
+            self.products.setdefault(observer_id, {})[record["prod"]] = record["price"]
+        else:
+            products = self.products.get(observer_id)
+            if isinstance(products, dict):
+                products.pop(record["prod"], None)
     
     def _save_data(self):
-        with open(self.file_path, 'w') as file:
-            json.dump(self.products, file, indent=4)
+        with open(self.file_path, 'wb') as file:
+            file.write(_dumps(self.products))
+
+    def _log(self, op, observer_id, product_name, price=None):
+        # Append one change record instead of rewriting the whole products.json
+        record = {"op": op, "oid": str(observer_id), "prod": product_name, "price": price}
+        line = _dumps(record, indent=False) + b"\n"
+        self._submit(self._append, line)
+        self._journal_size += len(line)
+        if self._journal_size > self.journal_limit:
+            self.compact()
+
+    def _append(self, line):
+        self._journal.write(line)
+        os.fsync(self._journal.fileno())
+
+    def compact(self):
+        # Snapshot the products now; the write is queued behind the journal records it covers
+        self._journal_size = 0
+        return self._submit(self._replace_data, _dumps(self.products))
+
+    def _submit(self, func, *args):
+        future = self._writer.submit(func, *args)
+        future.add_done_callback(self._record_error)
+        return future
+
+    def _record_error(self, future):
+        # Runs in the writer thread, before it picks up the next queued write
+        if future.exception() is not None and self._write_error is None:
+            self._write_error = future.exception()
+
+    def _replace_data(self, data):
+        # Write a fresh products.json, swap it in atomically and start a new journal
+        tmp_path = self.file_path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.file_path)
+        self._journal.truncate(0)
+
+    def flush(self):
+        # Future that completes once every write queued so far is on disk,
+        # or fails with the first write error so callers never report a lost change as saved
+        return self._writer.submit(self._check_writes)
+
+    def _check_writes(self):
+        if self._write_error is not None:
+            raise self._write_error
+
+    def close(self):
+        # Compact the journal into products.json and release the journal file
+        atexit.unregister(self.close)
+        self._writer.shutdown(wait=True)
+        if self._journal.tell():  # Nothing to compact if no changes were journaled
+            self._replace_data(_dumps(self.products))
+        self._journal.close()
     
     def add_product(self, observer_id, product_name, initial_price):
-        if observer_id in self.products:
-            # If observer exists, update/add the product to its dictionary of products
-            self.products[observer_id][product_name] = initial_price
-        else:
-            # If observer doesn't exist, create a new dictionary for products
-            self.products[observer_id] = {product_name: initial_price}
-        self._save_data()
+        # Observer ids are stored as str keys, as they are when loaded from products.json
+        observer_id = str(observer_id)
+        # Create the observer's product dictionary on first use, then add/update the product
+        self.products.setdefault(observer_id, {})[product_name] = initial_price
+        self._log("put", observer_id, product_name, initial_price)
         return True
     
     def update_price(self, observer_id, product_name, new_price):
-        if observer_id in self.products and product_name in self.products[observer_id]:
+        observer_id = str(observer_id)
+        products = self.products.get(observer_id)
+        if products is not None and product_name in products:
+            if products[product_name] == new_price:
+                return True  # Price unchanged, nothing to record
             # Update the price if the observer and product exist
-            self.products[observer_id][product_name] = new_price
-            self._save_data()
+            products[product_name] = new_price
+            self._log("put", observer_id, product_name, new_price)
             return True
         return False
 
+    def pop_product(self, observer_id, product_name):
+        # Remove a tracked product with a single journal record
+        observer_id = str(observer_id)
+        products = self.products.get(observer_id)
+        if not isinstance(products, dict) or product_name not in products:
+            return False
+        del products[product_name]
+        self._log("del", observer_id, product_name)
+        return True
+
+    def last_observer_id(self):
+        # Highest numeric observer id stored so far (0 if there are none)
+        return max((int(key) for key in map(str, self.products) if key.isdigit()), default=0)
+
     def get_price(self, observer_id):
-        if observer_id in self.products:
-            return self.products[observer_id]  # Return the products associated with the observer_id
-        return {}  # Return an empty dictionary if observer_id is not found
+        products = self.products.get(str(observer_id))
+        if isinstance(products, dict):
+            return products  # Return the products associated with the observer_id
+        return {}  # Return an empty dictionary if observer_id is not found (or holds a legacy entry)
     
-    def __repr__(self):
+    @property
+    def all(self):
+        # All Observer-Product pairs
         return self.products
 
+    def __repr__(self):
+        return f"<PriceFetcher n={len(self.products)}>"
+
+
+_fetcher = None
+
+def get_fetcher():
+    # Module-level accessor for the PriceFetcher singleton
+    if _fetcher is None:
+        return _init_fetcher()
+    return _fetcher
+
+def _init_fetcher():
+    global _fetcher, _oid_gen
+    fetcher = object.__new__(PriceFetcher)
+    fetcher._setup()
+    # Continue numbering after the stored ids so they stay unique across restarts
+    _oid_gen = itertools.count(fetcher.last_observer_id() + 1)
+    _fetcher = PriceFetcher._instance = fetcher
+    return fetcher
+
 
 # Factory pattern Implementation - Price Tracker Factory(), PriceTracker()
 class PriceTrackerFactory():
@@ -114,23 +305,23 @@ class PriceTrackerFactory():
         return PriceTracker(product_name)
     
     def create_price_fetcher(self):
-        return PriceFetcher()
+        return get_fetcher()
     
 class PriceTracker():
     def __init__(self, product_name):
         self.product_name = product_name
-        self.observers = []
+        self.observers = {}  # observer_id -> observer, so notify is a single lookup
 
     def attach(self, observer):
-        self.observers.append(observer)
+        self.observers[observer.observer_id] = observer
 
     def detach(self, observer):
-        self.observers.remove(observer)
+        self.observers.pop(observer.observer_id, None)
 
     def notify(self,observer_id, price):
-        for observer in self.observers:
-            if observer.observer_id==observer_id:
-                observer.update(price)
+        observer = self.observers.get(observer_id)
+        if observer is not None:
+            observer.update(price)
 
     def update_price(self, observer_id, product_name, new_price):
         immediate_update_strategy = ImmediateUpdate()
@@ -150,22 +341,13 @@ class ProductManagementSystem:
         self.root = root
         self.root.title("Product Management System")
         self.price_tracker_factory = PriceTrackerFactory()
-        self.price_fetcher = PriceFetcher()
+        self.price_fetcher = get_fetcher()
+        # users.json only changes through save_users, so it is read once and cached
+        self._users = self.load_users()
+        self._users_writer = ThreadPoolExecutor(max_workers=1)  # Serialises users.json writes
 
         self.create_login_ui()
     
-    def load_users():
-        try:
-         with open('users.json', 'r') as file:
-            return json.load(file)
-        except FileNotFoundError:
-            return {}  # Return an empty dictionary if the file is not found
-
-# Function to save user data to JSON file
-    def save_users(users_data):
-        with open('users.json', 'w') as file:
-            json.dump(users_data, file, indent=4)
-
     #Decorator pattern - display_title_at_top
     def display_title_at_top(func):
         def wrapper(self):
@@ -215,36 +397,36 @@ class ProductManagementSystem:
 
     def load_users(self):
             try:
-                with open('users.json', 'r') as file:
-                    return json.load(file)
+                with open('users.json', 'rb') as file:
+                    return _loads(file.read())
             except FileNotFoundError:
                 return {}  # Return an empty dictionary if the file is not found
 
 # Function to save user data to JSON file
     def save_users(self,users_data):
-        with open('users.json', 'w') as file:
-            json.dump(users_data, file, indent=4)
+        with open('users.json', 'wb') as file:
+            file.write(_dumps(users_data))
 
     def validate_user_credentials(self, username, password):
         # Replace this with actual validation against your database
         # For demonstration, assume 'admin' as the admin username and password
         
-        global users_data
-        users_data=self.load_users()
         if username == 'admin' and password == 'admin_password':
             return 'admin'
-        if username in users_data and users_data[username]['password'] == password:
+        if username in self._users and self._users[username]['password'] == password:
             return True
-        if username not in users_data:
+        if username not in self._users:
             self.register_user(username,password) # Registration successful
         return False 
     
-    def register_user(self, username, password):
+    @async_handler
+    async def register_user(self, username, password):
         # Backend: Implement logic to add a new user to the database
         # For demonstration, let's add the new user to the users_db dictionary
-        if username not in users_data:
-            users_data[username] = {"password": password}
-            self.save_users(users_data)
+        if username not in self._users:
+            self._users[username] = {"password": password}
+            # Write a snapshot of users.json in a worker thread so the GUI keeps responding
+            await asyncio.get_running_loop().run_in_executor(self._users_writer, self.save_users, dict(self._users))
             messagebox.showinfo("Registration", "Registration successful! You can now login.")
         else:
             messagebox.showerror("Registration Failed", "Username already exists. Please choose another username.")
@@ -284,54 +466,55 @@ class ProductManagementSystem:
         self.add_product_button = CTkButton(user_window, text="Add Product", command=self.add_product)
         self.add_product_button.pack()
 
-    def add_product(self):
+    @async_handler
+    async def add_product(self):
         product_name = self.product_name_entry.get()
-        product_price = self.product_price_entry.get()
+        # Store prices as numbers, not the raw entry text
+        product_price = _parse_price(self.product_price_entry.get())
+        if product_price is None:
+            messagebox.showerror("Invalid Price", "Please enter a numeric product price.")
+            return
 
         # Backend: Implement logic to add product using PriceTrackerFactory and PriceFetcher
         observer = PriceTracker_observer(product_name, product_price)  # Change observer_id accordingly
         price_tracker=self.price_tracker_factory.create_price_tracker(product_name)
         price_tracker.attach(observer)
         self.price_fetcher.add_product(observer.observer_id, product_name, product_price)
+        # The journal write runs in the fetcher's writer thread; wait for it without blocking the GUI
+        try:
+            await asyncio.wrap_future(self.price_fetcher.flush())
+        except OSError as error:
+            messagebox.showerror("Error", f"Could not save product {product_name}: {error}")
+            return
         messagebox.showinfo("Success", f"Product {product_name} added successfully!")
 
     def show_admin_view(self):
         admin_window = CTkToplevel(self.root)
         admin_window.title("Admin Panel")
 
-        all_products = self.price_fetcher.__repr__()  # Fetch all Observer-Product pairs
-
-        # Create a Canvas widget
-        canvas = CTkCanvas(admin_window)
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        # Add a scrollbar to the canvas
-        scrollbar = CTkScrollbar(admin_window, command=canvas.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        # Configure the canvas to scroll with the scrollbar
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        # Create a frame inside the canvas to contain the elements
-        frame = CTkFrame(canvas)
-        canvas.create_window((0, 0), window=frame, anchor=tk.NW)
+        all_products = self.price_fetcher.all  # Fetch all Observer-Product pairs
 
-        # Function to update canvas scroll region
-        def on_configure(event):
-            canvas.configure(scrollregion=canvas.bbox("all"))
-
-        frame.bind("<Configure>", on_configure)
+        # Scrollable container for the panel's widgets
+        frame = CTkScrollableFrame(admin_window)
+        frame.pack(fill=tk.BOTH, expand=True)
 
         # Display admin header
         header_label = CTkLabel(frame, text="Admin Panel")
         header_label.pack()
 
-        # Display observer-product pairs
-        for observer_id, products in all_products.items():
-            if isinstance(products, dict):
-                for product, price in products.items():
-                    product_info_label = CTkLabel(frame, text=f"Observer ID: {observer_id}, Product: {product}, Price: {price}")
-                    product_info_label.pack()
+        # Build the observer-product listing up front as one string
+        lines = [
+            f"Observer ID: {observer_id}, Product: {product}, Price: {price}"
+            for observer_id, products in all_products.items() if isinstance(products, dict)
+            for product, price in products.items()
+        ]
+        listing = "\n".join(lines)
+
+        # Display observer-product pairs in a single read-only textbox rather than one label each
+        products_textbox = CTkTextbox(frame)
+        products_textbox.insert("1.0", listing)
+        products_textbox.configure(state="disabled")
+        products_textbox.pack(fill=tk.BOTH, expand=True)
 
         # Display update price section
         self.observer_id_label = CTkLabel(frame, text="Observer ID")
@@ -352,29 +535,37 @@ class ProductManagementSystem:
         self.update_price_button = CTkButton(frame, text="Update Price", command=self.update_price)
         self.update_price_button.pack()
 
-        admin_window.mainloop()
-
-    def update_price(self):
+    @async_handler
+    async def update_price(self):
         observer_id = self.observer_id_entry.get()  # Fetch observer ID from the entry widget
         product_name = self.product_name_entry.get()
-        new_price = self.new_price_entry.get()
 
         print(f"Observer ID: {observer_id}")
         print(f"Product Name: {product_name}")
-        print(f"New Price: {new_price}")
 
         # Backend: Implement logic to update price using PriceTrackerFactory and PriceUpdater
         # Only admin can update prices
         if self.username_entry.get() == "admin":
             user_products = self.price_fetcher.get_price(observer_id)
             if observer_id and product_name in user_products:
-                # Update the price
-                success = self.price_fetcher.update_price(observer_id, product_name, new_price)
-                if success:
+                new_price = _parse_price(self.new_price_entry.get())
+                if new_price is None:
+                    messagebox.showerror("Invalid Price", "Please enter a numeric price.")
+                    return
+                print(f"New Price: {new_price}")
+
+                # The record is removed straight away, so there is no need to store the updated price first
+                if self.price_fetcher.pop_product(observer_id, product_name):
+                    try:
+                        await asyncio.wrap_future(self.price_fetcher.flush())
+                    except OSError as error:
+                        messagebox.showerror("Error", f"Could not save the update for {product_name}: {error}")
+                        return
+                    # Notify the user of the new price through their observer
+                    price_tracker = self.price_tracker_factory.create_price_tracker(product_name)
+                    price_tracker.attach(PriceTracker_observer(product_name, new_price, observer_id))
+                    price_tracker.notify(observer_id, new_price)
                     messagebox.showinfo("Success", f"Price for {product_name} updated successfully!")
-                    # Remove the record after updating the price
-                    del self.price_fetcher.products[observer_id][product_name]
-                    self.price_fetcher._save_data()
                     print(f"Record for {product_name} deleted after update.")
                 else:
                     messagebox.showerror("Error", f"Failed to update the price for {product_name}.")
@@ -393,5 +584,5 @@ if __name__ == "__main__":
     root = CTk()
     app = ProductManagementSystem(root)
 
-    root.mainloop()
-    print(users_data)
\ No newline at end of file
+    async_mainloop(root)
+    print(app._users)
\ No newline at end of file